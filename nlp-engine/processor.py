@@ -522,7 +522,7 @@ class NLPProcessor:
             processing_time=processing_time
         )
         
-        logger.info(f"Processed request - Intent: {result.intent}, Entities: {len(result.entities)}, Time: {processing_time:.3f}s")
+        logger.info(f"Processed request - Intent: {result.intent}, Entities: {len(result.entities.model_dump(exclude_none=True))}, Time: {processing_time:.3f}s")
         return result
 
 
@@ -309,7 +309,7 @@ class WorkflowOrchestrator:
         return {
             "processed_request": processed.dict(),
             "intent": processed.intent,
-            "entities": processed.entities,
+            "entities": processed.entities.model_dump(exclude_none=True),
             "confidence": processed.confidence
         }
     
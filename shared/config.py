@@ -18,6 +18,7 @@ class Settings(BaseSettings):
     slack_signing_secret: str = ""
     slack_admin_channel: Optional[str] = None  # Channel for error notifications
     slack_default_channel: Optional[str] = None  # Default channel for notifications
+    update_worker_count: int = 8  # Concurrent workers sending operation status updates
     
     # GitHub Configuration
     github_token: str = ""
@@ -4,37 +4,78 @@ Uses Redis for message queuing and pub/sub
 """
 
 import asyncio
-import json
 import logging
-from typing import AsyncGenerator, Dict, Any, Optional
+import random
+from typing import AsyncGenerator, Callable, Dict, Any, List, Optional, Tuple
 from contextlib import asynccontextmanager
 
 import redis.asyncio as redis
 from redis.asyncio import Redis
+import orjson
+import brotli
 
 from shared.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Queued payloads are prefixed with a one-byte flag telling consumers how to decode them
+_FLAG_RAW = b"\x00"
+_FLAG_BROTLI = b"\x01"
+_COMPRESSION_THRESHOLD = 4096  # bytes
+
+# publish_nowait batching: flush after this many messages or this many seconds
+_PUBLISH_BATCH_SIZE = 128
+_PUBLISH_BATCH_WINDOW = 0.005
+_PUBLISH_FLUSH_TIMEOUT = 5  # seconds disconnect() waits for queued messages to be written
+
+# Consumer retry backoff after Redis errors, in seconds
+_RETRY_DELAY_INITIAL = 0.1
+_RETRY_DELAY_MAX = 30
+
+# Process-wide connection pools, keyed by Redis URL
+_redis_pools: Dict[str, redis.BlockingConnectionPool] = {}
+
+
+async def _get_pool(redis_url: str = None) -> redis.BlockingConnectionPool:
+    """Get the shared connection pool for a Redis URL, creating it on first use
+    
+    A blocking pool makes callers wait for a free connection under bursts
+    instead of failing with "Too many connections".
+    """
+    redis_url = redis_url or settings.redis_url
+    pool = _redis_pools.get(redis_url)
+    if pool is None:
+        pool = redis.BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=settings.redis_max_connections,
+            timeout=5
+        )
+        _redis_pools[redis_url] = pool
+    return pool
+
+
+async def _close_pools():
+    """Disconnect and forget all shared connection pools"""
+    for pool in _redis_pools.values():
+        await pool.disconnect()
+    _redis_pools.clear()
+
 
 class MessageQueue:
     """Async message queue using Redis"""
     
     def __init__(self, redis_url: str = None):
         self.redis_url = redis_url or settings.redis_url
-        self.redis_pool: Optional[redis.ConnectionPool] = None
         self.redis_client: Optional[Redis] = None
+        # Messages queued by publish_nowait, written in pipelines by _publisher_task
+        self._publish_queue: asyncio.Queue = asyncio.Queue()
+        self._publisher_task: Optional[asyncio.Task] = None
         
     async def connect(self):
         """Initialize Redis connection"""
         if self.redis_client is None:
-            self.redis_pool = redis.ConnectionPool.from_url(
-                self.redis_url,
-                max_connections=settings.redis_max_connections,
-                decode_responses=True
-            )
-            self.redis_client = Redis(connection_pool=self.redis_pool)
+            self.redis_client = Redis(connection_pool=await _get_pool(self.redis_url))
             
             # Test connection
             try:
@@ -45,13 +86,47 @@ class MessageQueue:
                 raise
     
     async def disconnect(self):
-        """Close Redis connection"""
+        """Close Redis connection (the shared pool stays open for other users)"""
+        if self._publisher_task or not self._publish_queue.empty():
+            # Restart a publisher that died with messages still queued, so join() can finish
+            self.start_publisher()
+            try:
+                await asyncio.wait_for(self._publish_queue.join(), _PUBLISH_FLUSH_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.error(f"Dropping {self._publish_queue.qsize()} unpublished messages on disconnect")
+            self._publisher_task.cancel()
+            self._publisher_task = None
         if self.redis_client:
             await self.redis_client.close()
             self.redis_client = None
-        if self.redis_pool:
-            await self.redis_pool.disconnect()
-            self.redis_pool = None
+    
+    def _serialize_message(self, message: Dict[str, Any], priority: int) -> bytes:
+        """Wrap a message in the queue envelope and serialize it
+        
+        Payloads above _COMPRESSION_THRESHOLD are brotli-compressed; small
+        messages are left uncompressed.
+        """
+        message_data = {
+            "data": message,
+            "priority": priority,
+            "timestamp": asyncio.get_event_loop().time()
+        }
+        
+        data = orjson.dumps(message_data)
+        if len(data) > _COMPRESSION_THRESHOLD:
+            return _FLAG_BROTLI + brotli.compress(data, quality=4)
+        return _FLAG_RAW + data
+    
+    @staticmethod
+    def _deserialize_message(raw: bytes) -> Dict[str, Any]:
+        """Decode a queued message envelope and return its data"""
+        flag, payload = raw[:1], raw[1:]
+        if flag == _FLAG_BROTLI:
+            payload = brotli.decompress(payload)
+        elif flag != _FLAG_RAW:
+            payload = raw  # Unprefixed JSON written before payload flags existed
+        
+        return orjson.loads(payload)["data"]
     
     async def publish(self, channel: str, message: Dict[str, Any], priority: int = 0):
         """Publish a message to a channel"""
@@ -59,13 +134,7 @@ class MessageQueue:
             await self.connect()
         
         try:
-            message_data = {
-                "data": message,
-                "priority": priority,
-                "timestamp": asyncio.get_event_loop().time()
-            }
-            
-            serialized_message = json.dumps(message_data)
+            serialized_message = self._serialize_message(message, priority)
             await self.redis_client.lpush(channel, serialized_message)
             
             logger.debug(f"Published message to {channel}: {len(serialized_message)} bytes")
@@ -74,32 +143,145 @@ class MessageQueue:
             logger.error(f"Error publishing message to {channel}: {e}")
             raise
     
+    def publish_nowait(self, channel: str, message: Dict[str, Any], priority: int = 0) -> None:
+        """Queue a message for publishing without waiting on Redis
+        
+        Messages are written by a background publisher in pipelined batches.
+        Publish errors are logged by the publisher, not raised to the caller.
+        """
+        self._publish_queue.put_nowait((channel, self._serialize_message(message, priority)))
+        self.start_publisher()
+    
+    def start_publisher(self):
+        """Start the background publisher for publish_nowait if it isn't running"""
+        if self._publisher_task is None or self._publisher_task.done():
+            self._publisher_task = asyncio.create_task(self._publish_batcher())
+    
+    @staticmethod
+    async def _backoff(retry_delay: float) -> float:
+        """Sleep for a jittered retry delay and return the next, doubled delay"""
+        retry_delay = min(retry_delay, _RETRY_DELAY_MAX)
+        await asyncio.sleep(retry_delay + random.uniform(0, retry_delay / 2))
+        return retry_delay * 2
+    
+    async def _next_publish_batch(self) -> List[Tuple[str, bytes]]:
+        """Wait for a queued message, then gather more for up to _PUBLISH_BATCH_WINDOW"""
+        batch = [await self._publish_queue.get()]
+        deadline = asyncio.get_running_loop().time() + _PUBLISH_BATCH_WINDOW
+        
+        while len(batch) < _PUBLISH_BATCH_SIZE:
+            try:
+                batch.append(self._publish_queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._publish_queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def _publish_batcher(self):
+        """Write publish_nowait messages to Redis, one pipeline per batch"""
+        while True:
+            batch = await self._next_publish_batch()
+            
+            try:
+                if not self.redis_client:
+                    await self.connect()
+                
+                pipe = self.redis_client.pipeline(transaction=False)
+                for channel, serialized_message in batch:
+                    pipe.lpush(channel, serialized_message)
+                await pipe.execute()
+                
+                logger.debug(f"Published batch of {len(batch)} messages")
+                
+            except Exception as e:
+                logger.error(f"Error publishing batch of {len(batch)} messages: {e}")
+            finally:
+                for _ in batch:
+                    self._publish_queue.task_done()
+    
     async def consume(self, channel: str, timeout: int = 0) -> AsyncGenerator[Dict[str, Any], None]:
         """Consume messages from a channel"""
         if not self.redis_client:
             await self.connect()
         
+        retry_delay = _RETRY_DELAY_INITIAL
         while True:
             try:
                 # Use BRPOP for blocking right pop with timeout
                 result = await self.redis_client.brpop(channel, timeout=timeout or 0)
+                retry_delay = _RETRY_DELAY_INITIAL
                 
                 if result is None:
                     if timeout > 0:
                         break  # Timeout reached
                     continue
                 
-                _, message_str = result
-                message_data = json.loads(message_str)
+                _, raw_message = result
                 
-                yield message_data["data"]
+                try:
+                    message = self._deserialize_message(raw_message)
+                except Exception as e:
+                    logger.error(f"Dropping undecodable message from {channel}: {e}")
+                    continue
+                
+                yield message
                 
             except asyncio.CancelledError:
                 logger.info(f"Consumer for {channel} cancelled")
                 break
             except Exception as e:
                 logger.error(f"Error consuming from {channel}: {e}")
-                await asyncio.sleep(1)  # Brief pause before retrying
+                retry_delay = await self._backoff(retry_delay)
+
+    async def multi_consume_batches(self, channels: List[str], count: int = 32) -> AsyncGenerator[Tuple[str, List[Dict[str, Any]]], None]:
+        """Consume batches of messages from several channels with a single blocking client
+        
+        Uses BLMPOP (Redis 7+) so one connection waits on every queue and
+        pops up to ``count`` messages per round trip. Yields ``(channel, messages)``.
+        """
+        if not self.redis_client:
+            await self.connect()
+        
+        retry_delay = _RETRY_DELAY_INITIAL
+        while True:
+            try:
+                result = await self.redis_client.blmpop(
+                    0, len(channels), *channels, direction="RIGHT", count=count
+                )
+                retry_delay = _RETRY_DELAY_INITIAL
+                
+                if result is None:
+                    continue
+                
+                channel, raw_messages = result
+                channel = channel.decode()
+                
+                # Decode each message on its own so one bad frame doesn't lose the batch
+                messages = []
+                for raw in raw_messages:
+                    try:
+                        messages.append(self._deserialize_message(raw))
+                    except Exception as e:
+                        logger.error(f"Dropping undecodable message from {channel}: {e}")
+                
+                if messages:
+                    yield channel, messages
+                
+            except asyncio.CancelledError:
+                logger.info(f"Consumer for {', '.join(channels)} cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Error consuming from {', '.join(channels)}: {e}")
+                retry_delay = await self._backoff(retry_delay)
     
     async def get_queue_length(self, channel: str) -> int:
         """Get the number of messages in a queue"""
@@ -131,9 +313,9 @@ class MessageQueue:
             async for message in pubsub.listen():
                 if message["type"] == "pmessage":
                     try:
-                        data = json.loads(message["data"])
+                        data = orjson.loads(message["data"])
                         yield data
-                    except json.JSONDecodeError as e:
+                    except orjson.JSONDecodeError as e:
                         logger.error(f"Error decoding notification message: {e}")
                         
         finally:
@@ -162,7 +344,7 @@ class MessageQueue:
         if not self.redis_client:
             await self.connect()
         
-        serialized_value = json.dumps(value) if not isinstance(value, str) else value
+        serialized_value = orjson.dumps(value) if not isinstance(value, str) else value
         await self.redis_client.setex(key, ttl_seconds, serialized_value)
     
     async def get(self, key: str) -> Optional[Any]:
@@ -175,9 +357,9 @@ class MessageQueue:
             return None
         
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            return value  # Return as string if not JSON
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            return value.decode(errors="replace")  # Return as string if not JSON
     
     async def delete(self, key: str) -> bool:
         """Delete a key"""
@@ -220,13 +402,26 @@ class EventBus:
     
     def __init__(self, message_queue: MessageQueue):
         self.message_queue = message_queue
-        self.event_handlers = {}
+        # event_type -> ((is_coroutine, handler), ...), resolved once at registration
+        self.event_handlers: Dict[str, Tuple[Tuple[bool, Callable], ...]] = {}
     
-    def register_handler(self, event_type: str, handler):
+    def register_handler(self, event_type: str, handler: Callable):
         """Register an event handler"""
-        if event_type not in self.event_handlers:
-            self.event_handlers[event_type] = []
-        self.event_handlers[event_type].append(handler)
+        self.event_handlers[event_type] = (
+            *self.event_handlers.get(event_type, ()),
+            (asyncio.iscoroutinefunction(handler), handler)
+        )
+    
+    async def _dispatch(self, event_type: str, data: Dict[str, Any]):
+        """Call local handlers registered for an event type"""
+        for is_coro, handler in self.event_handlers.get(event_type, ()):
+            try:
+                if is_coro:
+                    await handler(data)
+                else:
+                    handler(data)
+            except Exception as e:
+                logger.error(f"Error in event handler for {event_type}: {e}")
     
     async def emit(self, event_type: str, data: Dict[str, Any]):
         """Emit an event"""
@@ -237,31 +432,12 @@ class EventBus:
         })
         
         # Call local handlers
-        if event_type in self.event_handlers:
-            for handler in self.event_handlers[event_type]:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(data)
-                    else:
-                        handler(data)
-                except Exception as e:
-                    logger.error(f"Error in event handler for {event_type}: {e}")
+        await self._dispatch(event_type, data)
     
     async def listen_for_events(self, event_pattern: str = "*"):
         """Listen for events and dispatch to handlers"""
         async for message in self.message_queue.consume(f"events:{event_pattern}"):
-            event_type = message.get("event_type")
-            data = message.get("data", {})
-            
-            if event_type in self.event_handlers:
-                for handler in self.event_handlers[event_type]:
-                    try:
-                        if asyncio.iscoroutinefunction(handler):
-                            await handler(data)
-                        else:
-                            handler(data)
-                    except Exception as e:
-                        logger.error(f"Error in event handler for {event_type}: {e}")
+            await self._dispatch(message.get("event_type"), message.get("data", {}))
 
 
 # Global instances
@@ -293,4 +469,6 @@ async def cleanup_messaging():
         await _message_queue.disconnect()
         _message_queue = None
     
+    await _close_pools()
+    
     _event_bus = None
@@ -9,6 +9,11 @@ from enum import Enum
 from pydantic import BaseModel, Field
 
 
+def _now() -> datetime:
+    """Current local time; resolved through the module so tests can replace the clock"""
+    return datetime.now()
+
+
 class CommandType(str, Enum):
     GITHUB = "github"
     CODE = "code"
@@ -24,7 +29,7 @@ class SlackRequest(BaseModel):
     command_type: CommandType = CommandType.GITHUB
     response_url: Optional[str] = None
     trigger_id: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: datetime = Field(default_factory=_now)
     
     class Config:
         use_enum_values = True
@@ -46,12 +51,35 @@ class Entity(BaseModel):
     end_pos: int = 0
 
 
+class Entities(BaseModel):
+    """Entities extracted from a request
+    
+    The fields used to build GitHub operations are declared explicitly so
+    they can be read as attributes; any other entity type is kept as an extra.
+    """
+    repository: Optional[str] = None
+    branch: Optional[str] = None
+    file: Optional[str] = None
+    description: Optional[str] = None
+    language: Optional[str] = None
+    function: Optional[str] = None
+    
+    def get(self, entity_type: str) -> Optional[str]:
+        """Get entity value by type, including extra entity types"""
+        if entity_type in type(self).model_fields:
+            return getattr(self, entity_type)
+        return (self.model_extra or {}).get(entity_type)
+    
+    class Config:
+        extra = "allow"
+
+
 class ProcessedRequest(BaseModel):
     """Model for processed NLP request"""
     original_text: str
     intent: str
     confidence: float
-    entities: Dict[str, str] = Field(default_factory=dict)
+    entities: Entities = Field(default_factory=Entities)
     raw_entities: List[Entity] = Field(default_factory=list)
     processing_time: Optional[float] = None
     
@@ -61,7 +89,7 @@ class ProcessedRequest(BaseModel):
     
     def has_entity(self, entity_type: str) -> bool:
         """Check if entity exists"""
-        return entity_type in self.entities
+        return self.entities.get(entity_type) is not None
 
 
 class GitHubOperation(BaseModel):
@@ -83,14 +111,14 @@ class GitHubOperation(BaseModel):
         """Create GitHubOperation from ProcessedRequest"""
         return cls(
             operation_type=processed.intent,
-            repository=processed.get_entity("repository"),
-            branch=processed.get_entity("branch"),
-            file_path=processed.get_entity("file"),
+            repository=processed.entities.repository,
+            branch=processed.entities.branch,
+            file_path=processed.entities.file,
             user_id=user_id,
             parameters={
-                "description": processed.get_entity("description"),
-                "language": processed.get_entity("language"),
-                "function": processed.get_entity("function")
+                "description": processed.entities.description,
+                "language": processed.entities.language,
+                "function": processed.entities.function
             }
         )
 
@@ -110,14 +138,14 @@ class OperationResult(BaseModel):
     success: bool
     result_data: Dict[str, Any] = Field(default_factory=dict)
     error_message: Optional[str] = None
-    start_time: datetime = Field(default_factory=datetime.now)
+    start_time: datetime = Field(default_factory=_now)
     end_time: Optional[datetime] = None
     processing_time: Optional[float] = None
     
     def mark_completed(self, success: bool, result_data: Dict[str, Any] = None, 
                       error_message: str = None):
         """Mark operation as completed"""
-        self.end_time = datetime.now()
+        self.end_time = _now()
         self.processing_time = (self.end_time - self.start_time).total_seconds()
         self.success = success
         self.status = OperationStatus.COMPLETED if success else OperationStatus.FAILED
@@ -160,7 +188,7 @@ class CodeSnippet(BaseModel):
     description: Optional[str] = None
     tags: List[str] = Field(default_factory=list)
     created_by: str
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=_now)
     usage_count: int = 0
 
 
@@ -184,7 +212,7 @@ class WorkflowExecution(BaseModel):
     steps: List[WorkflowStep]
     current_step: int = 0
     status: OperationStatus = OperationStatus.PENDING
-    start_time: datetime = Field(default_factory=datetime.now)
+    start_time: datetime = Field(default_factory=_now)
     end_time: Optional[datetime] = None
     results: Dict[str, Any] = Field(default_factory=dict)
     errors: List[str] = Field(default_factory=list)
@@ -5,16 +5,21 @@ Handles Slack events, slash commands, and interactive components
 
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
 import asyncio
-import json
+import random
+import re
+import time
+from datetime import datetime
 
+import aiohttp
+import orjson
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 from slack_sdk.web.async_client import AsyncWebClient
 from slack_sdk.errors import SlackApiError
 from slack_sdk.models.blocks import (
-    SectionBlock, ContextBlock, InputBlock, DividerBlock,
+    SectionBlock, InputBlock, DividerBlock,
     MarkdownTextObject, PlainTextObject, Option
 )
 from slack_sdk.models.views import View
@@ -22,7 +27,7 @@ from slack_sdk.models.blocks.block_elements import (
     StaticSelectElement, PlainTextInputElement
 )
 
-from shared.models import SlackRequest, GitHubOperation
+from shared.models import GitHubOperation
 from shared.messaging import MessageQueue
 from shared.config import get_settings
 
@@ -41,19 +46,54 @@ app = AsyncApp(
 )
 message_queue = MessageQueue()
 
+_MENTION_RE = re.compile(r'<@[A-Z0-9]+>')
+
+# Block Kit templates for progress updates; only the text fields vary per call
+_STATUS_TPL = {"type": "section", "text": {"type": "mrkdwn", "text": ""}}
+_DETAILS_TPL = {"type": "section", "text": {"type": "mrkdwn", "text": ""}}
+_CONTEXT_TPL = {"type": "context", "elements": [{"type": "mrkdwn", "text": ""}]}
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    """Create a keep-alive HTTP session shared by all Slack Web API calls"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60)
+    )
+
+
+async def _call_with_retry(coro_factory: Callable[[], Awaitable[Any]], max_retries: int = 3):
+    """Call a Slack Web API method, waiting out 429 rate limits
+    
+    Sleeps for the Retry-After duration (or an exponential fallback when the
+    header is missing) plus up to 25% jitter. Other errors, and rate limits
+    that outlast max_retries, are raised to the caller.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await coro_factory()
+        except SlackApiError as e:
+            if e.response.status_code != 429 or attempt == max_retries:
+                raise
+            retry_after = e.response.headers.get("Retry-After")
+            delay = int(retry_after) if retry_after else 2 ** attempt
+            delay += random.random() * delay * 0.25
+            logger.warning(f"Slack rate limited, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
 
 class SlackBot:
-    def __init__(self):
-        self.client = AsyncWebClient(token=settings.slack_bot_token)
+    def __init__(self, client: Optional[AsyncWebClient] = None):
+        # Reuse Bolt's client so there is a single connection pool
+        self.client = client or app.client
         
     async def send_message(self, channel: str, text: str, blocks: Optional[list] = None):
         """Send a message to a Slack channel"""
         try:
-            result = await self.client.chat_postMessage(
+            result = await _call_with_retry(lambda: self.client.chat_postMessage(
                 channel=channel,
                 text=text,
                 blocks=blocks
-            )
+            ))
             return result
         except SlackApiError as e:
             logger.error(f"Error sending message: {e}")
@@ -62,12 +102,12 @@ class SlackBot:
     async def update_message(self, channel: str, ts: str, text: str, blocks: Optional[list] = None):
         """Update an existing message"""
         try:
-            result = await self.client.chat_update(
+            result = await _call_with_retry(lambda: self.client.chat_update(
                 channel=channel,
                 ts=ts,
                 text=text,
                 blocks=blocks
-            )
+            ))
             return result
         except SlackApiError as e:
             logger.error(f"Error updating message: {e}")
@@ -76,42 +116,50 @@ class SlackBot:
     async def send_progress_update(self, channel: str, ts: str, status: str, details: str = ""):
         """Send a progress update for an ongoing operation using Block Kit"""
         blocks = [
-            SectionBlock(
-                text=MarkdownTextObject(
-                    text=f"*Status:* {status}"
-                )
-            )
+            {**_STATUS_TPL, "text": {**_STATUS_TPL["text"], "text": f"*Status:* {status}"}}
         ]
         
         if details:
             blocks.append(
-                SectionBlock(
-                    text=MarkdownTextObject(
-                        text=f"*Details:* {details}"
-                    )
-                )
+                {**_DETAILS_TPL, "text": {**_DETAILS_TPL["text"], "text": f"*Details:* {details}"}}
             )
             
         # Add context with timestamp
-        blocks.append(
-            ContextBlock(
-                elements=[
-                    MarkdownTextObject(
-                        text=f"Last updated: <!date^{int(asyncio.get_event_loop().time())}^{{date_short}} {{time}}|now>"
-                    )
-                ]
-            )
-        )
+        blocks.append({
+            **_CONTEXT_TPL,
+            "elements": [{
+                **_CONTEXT_TPL["elements"][0],
+                "text": f"Last updated: <!date^{int(time.time())}^{{date_short}} {{time}}|now>"
+            }]
+        })
         
         await self.update_message(channel, ts, f"Operation Status: {status}", blocks)
 
 
-bot = SlackBot()
+bot = SlackBot(app.client)
 
 
-@app.command("/github")
-async def handle_github_command(ack, respond, command):
-    """Handle /github slash command"""
+# Static part of the in-channel acknowledgement sent for slash commands
+_IN_CHANNEL_RESPONSE_TPL = {"text": "", "response_type": "in_channel"}
+
+# Replies to slash commands sent without any text
+_GITHUB_HELP = {
+    "text": "Please provide a command. Example: `/github create a new branch called feature-auth in my-repo`",
+    "response_type": "ephemeral"
+}
+_CODE_HELP = {
+    "text": "Please provide a code request. Example: `/code add a Python function to validate emails`",
+    "response_type": "ephemeral"
+}
+_PR_HELP = {
+    "text": "Please provide a PR request. Example: `/pr create pull request for feature-auth branch`",
+    "response_type": "ephemeral"
+}
+
+
+async def _dispatch_slash(ack, respond, command, *, progress: str, topic: str,
+                          command_type: str, help_response: Dict[str, str]):
+    """Acknowledge a slash command, echo it to the channel and queue it for processing"""
     await ack()
     
     user_id = command["user_id"]
@@ -119,100 +167,63 @@ async def handle_github_command(ack, respond, command):
     text = command["text"]
     
     if not text:
-        await respond({
-            "text": "Please provide a command. Example: `/github create a new branch called feature-auth in my-repo`",
-            "response_type": "ephemeral"
-        })
+        await respond(help_response)
         return
     
-    # Send initial response
-    response = await respond({
-        "text": f"🔄 Processing your GitHub request: `{text}`",
-        "response_type": "in_channel"
+    # Queue for processing before responding so the Redis write overlaps the
+    # Slack round trip; the consumer validates it as a SlackRequest
+    message_queue.publish_nowait(topic, {
+        "user_id": user_id,
+        "channel_id": channel_id,
+        "command": text,
+        "command_type": command_type,
+        "response_url": command.get("response_url"),
+        "trigger_id": command.get("trigger_id"),
+        "timestamp": datetime.now()
     })
     
-    # Create request object
-    request = SlackRequest(
-        user_id=user_id,
-        channel_id=channel_id,
-        command=text,
-        response_url=command.get("response_url"),
-        trigger_id=command.get("trigger_id")
-    )
-    
-    # Queue for processing
-    await message_queue.publish("github_requests", request.dict())
+    # Send initial response
+    response = _IN_CHANNEL_RESPONSE_TPL.copy()
+    response["text"] = f"{progress}: `{text}`"
+    await respond(response)
     
-    logger.info(f"GitHub command queued: {text} from user {user_id}")
+    logger.info(f"Slash command queued to {topic}: {text} from user {user_id}")
+
+
+@app.command("/github")
+async def handle_github_command(ack, respond, command):
+    """Handle /github slash command"""
+    await _dispatch_slash(
+        ack, respond, command,
+        progress="🔄 Processing your GitHub request",
+        topic="github_requests",
+        command_type="github",
+        help_response=_GITHUB_HELP
+    )
 
 
 @app.command("/code")
 async def handle_code_command(ack, respond, command):
     """Handle /code slash command for direct code operations"""
-    await ack()
-    
-    user_id = command["user_id"]
-    channel_id = command["channel_id"]
-    text = command["text"]
-    
-    if not text:
-        await respond({
-            "text": "Please provide a code request. Example: `/code add a Python function to validate emails`",
-            "response_type": "ephemeral"
-        })
-        return
-    
-    # Send initial response
-    await respond({
-        "text": f"🧠 Analyzing your code request: `{text}`",
-        "response_type": "in_channel"
-    })
-    
-    # Create request object
-    request = SlackRequest(
-        user_id=user_id,
-        channel_id=channel_id,
-        command=text,
+    await _dispatch_slash(
+        ack, respond, command,
+        progress="🧠 Analyzing your code request",
+        topic="code_requests",
         command_type="code",
-        response_url=command.get("response_url"),
-        trigger_id=command.get("trigger_id")
+        help_response=_CODE_HELP
     )
-    
-    # Queue for processing
-    await message_queue.publish("code_requests", request.dict())
 
 
 @app.command("/pr")
 async def handle_pr_command(ack, respond, command):
     """Handle /pr slash command for pull request operations"""
-    await ack()
-    
-    user_id = command["user_id"]
-    channel_id = command["channel_id"]
-    text = command["text"]
-    
-    if not text:
-        await respond({
-            "text": "Please provide a PR request. Example: `/pr create pull request for feature-auth branch`",
-            "response_type": "ephemeral"
-        })
-        return
-    
-    await respond({
-        "text": f"📋 Processing your PR request: `{text}`",
-        "response_type": "in_channel"
-    })
-    
-    request = SlackRequest(
-        user_id=user_id,
-        channel_id=channel_id,
-        command=text,
+    await _dispatch_slash(
+        ack, respond, command,
+        progress="📋 Processing your PR request",
+        topic="pr_requests",
         command_type="pr",
-        response_url=command.get("response_url"),
-        trigger_id=command.get("trigger_id")
+        help_response=_PR_HELP
     )
-    
-    await message_queue.publish("pr_requests", request.dict())
 
 
 @app.event("app_mention")
@@ -223,9 +234,7 @@ async def handle_app_mention(event, say):
     text = event["text"]
     
     # Remove the bot mention from the text
-    mention_pattern = r'<@[A-Z0-9]+>'
-    import re
-    clean_text = re.sub(mention_pattern, '', text).strip()
+    clean_text = _MENTION_RE.sub('', text).strip()
     
     if not clean_text:
         await say(
@@ -234,72 +243,144 @@ async def handle_app_mention(event, say):
         )
         return
     
-    # Treat mentions as GitHub commands
-    request = SlackRequest(
-        user_id=user_id,
-        channel_id=channel_id,
-        command=clean_text,
-        command_type="mention"
-    )
+    # Treat mentions as GitHub commands; queue before replying so the Redis
+    # write overlaps the Slack round trip
+    message_queue.publish_nowait("github_requests", {
+        "user_id": user_id,
+        "channel_id": channel_id,
+        "command": clean_text,
+        "command_type": "mention",
+        "response_url": None,
+        "trigger_id": None,
+        "timestamp": datetime.now()
+    })
     
     await say(
         text=f"🔄 I'll help you with: `{clean_text}`",
         channel=channel_id
     )
-    
-    await message_queue.publish("github_requests", request.dict())
+
+
+# Confirmation posted once a PR button click has been queued
+_PR_ACTION_CONFIRMATIONS = {
+    "approve_pr": "✅ PR #{pr_number} approval requested by <@{user_id}>",
+    "reject_pr": "❌ PR #{pr_number} rejection requested by <@{user_id}>",
+}
+
+# Strong references to in-flight handler tasks so they aren't garbage collected
+_background_tasks: set = set()
+
+
+def _run_in_background(coro):
+    """Run a coroutine as a task that outlives the calling handler"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _finish_pr_action(operation_type: str, body: Dict[str, Any], action: Dict[str, Any]):
+    """Queue a PR approve/reject operation and confirm it in the channel"""
+    try:
+        user_id = body["user"]["id"]
+        channel_id = body["channel"]["id"]
+        
+        # Extract PR information from the action value
+        pr_data = orjson.loads(action["value"])
+        
+        operation = GitHubOperation.model_construct(
+            operation_type=operation_type,
+            repository=pr_data["repository"],
+            pr_number=pr_data["pr_number"],
+            user_id=user_id
+        )
+        
+        message_queue.publish_nowait("github_operations", operation.model_dump())
+        
+        # Update the message
+        await bot.send_message(
+            channel=channel_id,
+            text=_PR_ACTION_CONFIRMATIONS[operation_type].format(
+                pr_number=pr_data["pr_number"], user_id=user_id
+            )
+        )
+    except Exception as e:
+        logger.error(f"Error handling {operation_type} action: {e}")
 
 
 @app.action("approve_pr")
 async def handle_approve_pr(ack, body, action):
     """Handle PR approval button clicks"""
     await ack()
-    
-    user_id = body["user"]["id"]
-    channel_id = body["channel"]["id"]
-    
-    # Extract PR information from the action value
-    pr_data = json.loads(action["value"])
-    
-    operation = GitHubOperation(
-        operation_type="approve_pr",
-        repository=pr_data["repository"],
-        pr_number=pr_data["pr_number"],
-        user_id=user_id
-    )
-    
-    await message_queue.publish("github_operations", operation.dict())
-    
-    # Update the message
-    await bot.send_message(
-        channel=channel_id,
-        text=f"✅ PR #{pr_data['pr_number']} approval requested by <@{user_id}>"
-    )
+    _run_in_background(_finish_pr_action("approve_pr", body, action))
 
 
 @app.action("reject_pr")
 async def handle_reject_pr(ack, body, action):
     """Handle PR rejection button clicks"""
     await ack()
-    
-    user_id = body["user"]["id"]
-    channel_id = body["channel"]["id"]
-    
-    pr_data = json.loads(action["value"])
-    
-    operation = GitHubOperation(
-        operation_type="reject_pr",
-        repository=pr_data["repository"],
-        pr_number=pr_data["pr_number"],
-        user_id=user_id
-    )
-    
-    await message_queue.publish("github_operations", operation.dict())
-    
-    await bot.send_message(
-        channel=channel_id,
-        text=f"❌ PR #{pr_data['pr_number']} rejection requested by <@{user_id}>"
-    )
+    _run_in_background(_finish_pr_action("reject_pr", body, action))
+
+
+# The quick action modal is static, so serialize it once at import time
+_GITHUB_MODAL_VIEW = View(
+    type="modal",
+    callback_id="github_modal",
+    title=PlainTextObject(text="GitHub Operations"),
+    submit=PlainTextObject(text="Execute"),
+    close=PlainTextObject(text="Cancel"),
+    blocks=[
+        SectionBlock(
+            text=MarkdownTextObject(
+                text="Choose a GitHub operation to perform:"
+            )
+        ),
+        InputBlock(
+            block_id="action_type",
+            element=StaticSelectElement(
+                placeholder=PlainTextObject(text="Select an action"),
+                action_id="action_select",
+                options=[
+                    Option(
+                        text=PlainTextObject(text="Create Branch"),
+                        value="create_branch"
+                    ),
+                    Option(
+                        text=PlainTextObject(text="Generate Code"),
+                        value="generate_code"
+                    ),
+                    Option(
+                        text=PlainTextObject(text="Create PR"),
+                        value="create_pr"
+                    ),
+                    Option(
+                        text=PlainTextObject(text="Custom Command"),
+                        value="custom"
+                    )
+                ]
+            ),
+            label=PlainTextObject(text="Action Type")
+        ),
+        InputBlock(
+            block_id="repository",
+            element=PlainTextInputElement(
+                action_id="repo_input",
+                placeholder=PlainTextObject(text="e.g., owner/repo-name")
+            ),
+            label=PlainTextObject(text="Repository")
+        ),
+        InputBlock(
+            block_id="description",
+            element=PlainTextInputElement(
+                action_id="desc_input",
+                multiline=True,
+                placeholder=PlainTextObject(
+                    text="Describe what you want to do..."
+                )
+            ),
+            label=PlainTextObject(text="Description")
+        )
+    ]
+).to_dict()
 
 
 # Global shortcuts for quick access
@@ -311,65 +392,7 @@ async def handle_github_shortcut(ack, shortcut, client):
     # Open a modal for GitHub operations
     await client.views_open(
         trigger_id=shortcut["trigger_id"],
-        view=View(
-            type="modal",
-            callback_id="github_modal",
-            title=PlainTextObject(text="GitHub Operations"),
-            submit=PlainTextObject(text="Execute"),
-            close=PlainTextObject(text="Cancel"),
-            blocks=[
-                SectionBlock(
-                    text=MarkdownTextObject(
-                        text="Choose a GitHub operation to perform:"
-                    )
-                ),
-                InputBlock(
-                    block_id="action_type",
-                    element=StaticSelectElement(
-                        placeholder=PlainTextObject(text="Select an action"),
-                        action_id="action_select",
-                        options=[
-                            Option(
-                                text=PlainTextObject(text="Create Branch"),
-                                value="create_branch"
-                            ),
-                            Option(
-                                text=PlainTextObject(text="Generate Code"),
-                                value="generate_code"
-                            ),
-                            Option(
-                                text=PlainTextObject(text="Create PR"),
-                                value="create_pr"
-                            ),
-                            Option(
-                                text=PlainTextObject(text="Custom Command"),
-                                value="custom"
-                            )
-                        ]
-                    ),
-                    label=PlainTextObject(text="Action Type")
-                ),
-                InputBlock(
-                    block_id="repository",
-                    element=PlainTextInputElement(
-                        action_id="repo_input",
-                        placeholder=PlainTextObject(text="e.g., owner/repo-name")
-                    ),
-                    label=PlainTextObject(text="Repository")
-                ),
-                InputBlock(
-                    block_id="description",
-                    element=PlainTextInputElement(
-                        action_id="desc_input",
-                        multiline=True,
-                        placeholder=PlainTextObject(
-                            text="Describe what you want to do..."
-                        )
-                    ),
-                    label=PlainTextObject(text="Description")
-                )
-            ]
-        )
+        view=_GITHUB_MODAL_VIEW
     )
 
 
@@ -396,22 +419,25 @@ async def handle_github_modal_submission(ack, body, view):
     else:
         command = f"{description} in {repository}"
     
-    # Create request object
-    request = SlackRequest(
-        user_id=user_id,
-        channel_id=None,  # Modal doesn't have channel context
-        command=command,
-        command_type="modal"
-    )
+    # Create request payload; modals have no channel context, so replies go to the user's DM
+    request = {
+        "user_id": user_id,
+        "channel_id": user_id,
+        "command": command,
+        "command_type": "github",
+        "response_url": None,
+        "trigger_id": None,
+        "timestamp": datetime.now()
+    }
     
-    await message_queue.publish("github_requests", request.dict())
+    message_queue.publish_nowait("github_requests", request)
     
     # Send confirmation DM
     try:
-        await bot.client.chat_postMessage(
+        await _call_with_retry(lambda: bot.client.chat_postMessage(
             channel=user_id,
             text=f"🚀 I'm processing your request: `{command}`"
-        )
+        ))
     except Exception as e:
         logger.error(f"Failed to send DM: {e}")
 
@@ -420,10 +446,46 @@ async def handle_github_modal_submission(ack, body, view):
 @app.middleware
 async def log_request(logger, body, next):
     """Log all incoming requests for debugging"""
-    logger.info(f"Received Slack request: {body.get('type', 'unknown')}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Received Slack request: %s", body.get('type', 'unknown'))
     await next()
 
 
+# Admin error notifications are rate limited by a token bucket holding up to
+# _ADMIN_BURST messages, refilled at _ADMIN_RATE per second. Errors beyond that
+# are counted and summarised by flush_admin_errors every _ADMIN_FLUSH_INTERVAL.
+_ADMIN_RATE = 1.0
+_ADMIN_BURST = 5.0
+_ADMIN_FLUSH_INTERVAL = 5
+_admin_bucket = {"tokens": _ADMIN_BURST, "ts": time.monotonic()}
+_suppressed_admin_errors = {"count": 0, "latest": ""}
+
+
+def _take_admin_token() -> bool:
+    """Refill the admin notification bucket and take a token if one is available"""
+    now = time.monotonic()
+    _admin_bucket["tokens"] = min(
+        _ADMIN_BURST, _admin_bucket["tokens"] + (now - _admin_bucket["ts"]) * _ADMIN_RATE
+    )
+    _admin_bucket["ts"] = now
+    
+    if _admin_bucket["tokens"] < 1:
+        return False
+    _admin_bucket["tokens"] -= 1
+    return True
+
+
+async def _notify_admin(text: str):
+    """Post a message to the admin channel"""
+    try:
+        await _call_with_retry(lambda: bot.client.chat_postMessage(
+            channel=settings.slack_admin_channel,
+            text=text
+        ))
+    except Exception as e:
+        logger.error(f"Failed to send error notification: {e}")
+
+
 @app.error
 async def custom_error_handler(error, body):
     """Handle uncaught errors"""
@@ -432,42 +494,149 @@ async def custom_error_handler(error, body):
     
     # Send error notification to admin channel if configured
     if hasattr(settings, 'slack_admin_channel') and settings.slack_admin_channel:
+        if _take_admin_token():
+            await _notify_admin(f"⚠️ Slack app error: {str(error)[:500]}...")
+        else:
+            _suppressed_admin_errors["count"] += 1
+            _suppressed_admin_errors["latest"] = str(error)[:500]
+
+
+async def flush_admin_errors():
+    """Periodically post one summary of admin notifications dropped by the rate limit"""
+    while True:
+        await asyncio.sleep(_ADMIN_FLUSH_INTERVAL)
+        
+        count = _suppressed_admin_errors["count"]
+        if not count:
+            continue
+        latest = _suppressed_admin_errors["latest"]
+        _suppressed_admin_errors["count"] = 0
+        
+        await _notify_admin(
+            f"⚠️ {count} more Slack app errors in the last {_ADMIN_FLUSH_INTERVAL}s. "
+            f"Latest: {latest}..."
+        )
+
+
+# One queue per update worker. A channel always maps to the same worker, so its
+# updates stay ordered while a slow Slack call only delays its own shard.
+_update_shards: List[asyncio.Queue] = [
+    asyncio.Queue() for _ in range(max(1, settings.update_worker_count))
+]
+
+
+# Latest not-yet-sent update per (channel_id, message_ts), drained by flush_operation_updates
+_pending_updates: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_UPDATE_FLUSH_INTERVAL = 0.5  # seconds
+
+
+async def handle_operation_updates(updates: List[Dict[str, Any]]):
+    """Record the latest status of each message from a batch of operation updates"""
+    for update_data in updates:
         try:
-            await bot.client.chat_postMessage(
-                channel=settings.slack_admin_channel,
-                text=f"⚠️ Slack app error: {str(error)[:500]}..."
-            )
-        except Exception as e:
-            logger.error(f"Failed to send error notification: {e}")
+            _pending_updates[(update_data["channel_id"], update_data["message_ts"])] = update_data
+        except KeyError as e:
+            logger.error(f"Error processing operation update: missing {e}")
 
 
-async def process_operation_updates():
-    """Process operation status updates from the queue"""
-    async for message in message_queue.consume("operation_updates"):
+async def flush_operation_updates():
+    """Hand pending operation updates to the update workers every flush interval
+    
+    Updates are coalesced per message, so only the newest status of each
+    (channel, ts) pair within a window results in a chat_update call.
+    """
+    while True:
+        await asyncio.sleep(_UPDATE_FLUSH_INTERVAL)
+        
+        for (channel, _), update_data in _pending_updates.items():
+            _update_shards[hash(channel) % len(_update_shards)].put_nowait(update_data)
+        _pending_updates.clear()
+
+
+async def operation_update_worker(shard: asyncio.Queue):
+    """Send the progress updates queued on one shard"""
+    while True:
+        update_data = await shard.get()
         try:
-            update_data = json.loads(message)
-            
             await bot.send_progress_update(
                 channel=update_data["channel_id"],
                 ts=update_data["message_ts"],
                 status=update_data["status"],
                 details=update_data.get("details", "")
             )
-            
         except Exception as e:
             logger.error(f"Error processing operation update: {e}")
 
 
+# Queue name -> handler for batches of messages consumed by the bot
+QUEUE_HANDLERS: Dict[str, Callable[[List[Dict[str, Any]]], Awaitable[None]]] = {
+    "operation_updates": handle_operation_updates,
+}
+
+
+async def process_queues():
+    """Consume every bot queue with a single blocking client and dispatch by channel"""
+    async for channel, messages in message_queue.multi_consume_batches(list(QUEUE_HANDLERS)):
+        try:
+            await QUEUE_HANDLERS[channel](messages)
+        except Exception as e:
+            logger.error(f"Error processing {channel} messages: {e}")
+
+
+# Queue processing tasks started by start_background_tasks, cancelled by stop_background_tasks
+_queue_tasks: List[asyncio.Task] = []
+
+
+async def start_background_tasks():
+    """Prepare the shared HTTP session and start the queue processing tasks"""
+    # Without a session slack_sdk opens a fresh connection for every API call
+    app.client.session = create_http_session()
+    
+    _queue_tasks.append(asyncio.create_task(process_queues()))
+    _queue_tasks.append(asyncio.create_task(flush_operation_updates()))
+    for shard in _update_shards:
+        _queue_tasks.append(asyncio.create_task(operation_update_worker(shard)))
+    if settings.slack_admin_channel:
+        _queue_tasks.append(asyncio.create_task(flush_admin_errors()))
+
+
+async def stop_background_tasks():
+    """Stop the queue processing tasks, then flush in-flight work and close connections"""
+    for task in _queue_tasks:
+        task.cancel()
+    await asyncio.gather(*_queue_tasks, return_exceptions=True)
+    _queue_tasks.clear()
+    
+    # PR actions queue their operation and post a confirmation; don't cut them off
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    
+    # Flush messages accepted by publish_nowait before the shared pool goes away
+    await message_queue.disconnect()
+    
+    if app.client.session is not None:
+        await app.client.session.close()
+        app.client.session = None
+
+
 async def main():
     """Main application entry point"""
     handler = AsyncSocketModeHandler(app, settings.slack_app_token)
     
-    # Start the background task for processing updates
-    asyncio.create_task(process_operation_updates())
+    # Start the background tasks for processing queued messages
+    await start_background_tasks()
     
     # Start the Slack app
-    await handler.start_async()
+    try:
+        await handler.start_async()
+    finally:
+        await stop_background_tasks()
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass  # Fall back to the default asyncio event loop
+    
     asyncio.run(main())
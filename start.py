@@ -7,7 +7,9 @@ import sys
 import os
 import asyncio
 import logging
+import queue
 import signal
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 # Add project paths
@@ -17,18 +19,23 @@ sys.path.insert(0, str(project_root / "slack-bot"))
 sys.path.insert(0, str(project_root / "shared"))
 
 from shared.config import get_settings, validate_settings, print_configuration
-from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('slack-github-bot.log')
-    ]
-)
+# Configure logging. The stream and file handlers run on a QueueListener thread,
+# so logging from the event loop only enqueues records and never blocks on I/O.
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.StreamHandler(),
+    logging.FileHandler('slack-github-bot.log')
+]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(log_queue)])
+log_listener.start()
+
 logger = logging.getLogger(__name__)
 
 class SlackGitHubBot:
@@ -38,111 +45,11 @@ class SlackGitHubBot:
         self.settings = get_settings()
         
     async def create_app(self):
-        """Create and configure Slack app with all handlers"""
-        self.app = AsyncApp(
-            token=self.settings.slack_bot_token,
-            process_before_response=True
-        )
-        
-        # GitHub operations command
-        @self.app.command("/github")
-        async def handle_github_command(ack, say, command):
-            await ack()
-            user_id = command['user_id']
-            text = command['text']
-            
-            logger.info(f"GitHub command from {user_id}: {text}")
-            
-            # Basic response for now
-            await say({
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"🤖 *GitHub Operation Received*\n\n*Command:* `{text}`\n*Status:* Processing..."
-                        }
-                    },
-                    {
-                        "type": "context",
-                        "elements": [
-                            {
-                                "type": "mrkdwn",
-                                "text": f"Requested by <@{user_id}>"
-                            }
-                        ]
-                    }
-                ]
-            })
-        
-        # Code generation command
-        @self.app.command("/code")
-        async def handle_code_command(ack, say, command):
-            await ack()
-            user_id = command['user_id']
-            text = command['text']
-            
-            logger.info(f"Code command from {user_id}: {text}")
-            
-            await say({
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"💻 *Code Generation Request*\n\n*Request:* `{text}`\n*Status:* Generating code..."
-                        }
-                    }
-                ]
-            })
-        
-        # Pull request command
-        @self.app.command("/pr")
-        async def handle_pr_command(ack, say, command):
-            await ack()
-            user_id = command['user_id']
-            text = command['text']
-            
-            logger.info(f"PR command from {user_id}: {text}")
-            
-            await say({
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"🔄 *Pull Request Operation*\n\n*Command:* `{text}`\n*Status:* Processing PR request..."
-                        }
-                    }
-                ]
-            })
-        
-        # App mentions
-        @self.app.event("app_mention")
-        async def handle_mention(event, say):
-            user_id = event['user']
-            text = event['text']
-            
-            logger.info(f"Mention from {user_id}: {text}")
-            
-            await say({
-                "blocks": [
-                    {
-                        "type": "section",
-                        "text": {
-                            "type": "mrkdwn",
-                            "text": f"👋 Hello <@{user_id}>!\n\nI received your message: `{text}`\n\n*Available commands:*\n• `/github` - GitHub operations\n• `/code` - Code generation\n• `/pr` - Pull request management"
-                        }
-                    }
-                ]
-            })
-        
-        # Error handling
-        @self.app.error
-        async def error_handler(error, body, logger):
-            logger.error(f"Error: {error}")
-            logger.error(f"Request body: {body}")
+        """Load the Slack app from slack-bot/app.py and start its queue processing"""
+        from app import app, start_background_tasks
         
+        self.app = app
+        await start_background_tasks()
         logger.info("✅ Slack app configured with all handlers")
         return self.app
     
@@ -168,7 +75,7 @@ class SlackGitHubBot:
         self.handler = AsyncSocketModeHandler(self.app, self.settings.slack_app_token)
         
         logger.info("🔌 Connecting to Slack...")
-        await self.handler.start_async()
+        await self.handler.connect_async()
         
         return True
     
@@ -177,29 +84,41 @@ class SlackGitHubBot:
         if self.handler:
             logger.info("🛑 Stopping Slack connection...")
             await self.handler.close_async()
+        if self.app:
+            from app import stop_background_tasks
+            await stop_background_tasks()
         logger.info("👋 Bot stopped")
 
 # Global bot instance
 bot = SlackGitHubBot()
 
-def signal_handler(signum, frame):
-    """Handle shutdown signals"""
+# Set from signal_handler to wake main() for shutdown
+stop_event = asyncio.Event()
+
+def signal_handler(signum):
+    """Handle shutdown signals (runs as an event loop callback, not in signal context)"""
     logger.info(f"Received signal {signum}, shutting down...")
-    asyncio.create_task(bot.stop())
+    stop_event.set()
 
 async def main():
     """Main function"""
     # Setup signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, signal_handler, sig)
+        except NotImplementedError:
+            # Windows event loops have no add_signal_handler. A plain handler runs in
+            # signal context, so it must not log; it only schedules signal_handler.
+            signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(signal_handler, signum))
     
     try:
         success = await bot.start()
         if success:
             logger.info("🎉 Bot is running successfully!")
-            # Keep running until interrupted
-            while True:
-                await asyncio.sleep(1)
+            # Park until a shutdown signal arrives
+            await stop_event.wait()
+            await bot.stop()
         else:
             logger.error("❌ Failed to start bot")
             return 1
@@ -214,5 +133,14 @@ async def main():
     return 0
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass  # Fall back to the default asyncio event loop
+    
+    try:
+        exit_code = asyncio.run(main())
+    finally:
+        log_listener.stop()  # Flush queued records before exiting
     sys.exit(exit_code)
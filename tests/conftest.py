@@ -0,0 +1,131 @@
+"""
+Shared fixtures for the test suite
+"""
+
+import asyncio
+import types
+from datetime import datetime
+from functools import lru_cache
+
+import pytest
+from hypothesis import HealthCheck, settings
+
+# pytest loads this file before collecting any test module, so shared.models is
+# imported once here and test modules importing from it hit sys.modules. Tests
+# keep importing from shared.models directly: conftest is not an importable module.
+from shared.models import (
+    GitHubOperation, OperationResult, OperationStatus, ProcessedRequest, UserPreferences
+)
+
+USER_ID = "U123456"
+FROZEN_TIME = datetime(2024, 1, 1)
+
+_ENTITIES_GET = {"repo": "test-repo", "file": "main.py"}
+_ENTITIES_CREATE = (("repository", "my-repo"), ("file", "utils.py"), ("language", "python"))
+
+# Few examples and no example database keep property tests as cheap as the
+# fixed-input tests they replace. freeze_clock is function-scoped but constant,
+# so sharing it across a test's examples is safe.
+settings.register_profile(
+    "fast",
+    max_examples=5,
+    database=None,
+    deadline=None,
+    suppress_health_check=[HealthCheck.function_scoped_fixture]
+)
+settings.load_profile("fast")
+
+
+@pytest.fixture(autouse=True)
+def freeze_clock(monkeypatch):
+    """Make shared.models timestamps return FROZEN_TIME instead of reading the clock"""
+    monkeypatch.setattr(
+        "shared.models.datetime",
+        types.SimpleNamespace(now=lambda: FROZEN_TIME, utcnow=lambda: FROZEN_TIME)
+    )
+    return FROZEN_TIME
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record asyncio.sleep delays instead of sleeping"""
+    delays = []
+    
+    async def fake_sleep(delay):
+        delays.append(delay)
+    
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return delays
+
+
+@pytest.fixture(scope="module")
+def sample_processed_request():
+    """ProcessedRequest shared by the read-only tests of a module"""
+    return _make_processed_request("test", "test", 0.8, tuple(_ENTITIES_GET.items()))
+
+
+@pytest.fixture
+def user_preferences():
+    """Fresh UserPreferences for tests that mutate it"""
+    return UserPreferences(user_id=USER_ID)
+
+
+@pytest.fixture
+def processing_result():
+    """Fresh in-progress OperationResult for tests that complete it"""
+    return OperationResult(
+        operation_id="op123",
+        status=OperationStatus.PROCESSING,
+        success=False
+    )
+
+
+@lru_cache(maxsize=None)
+def _make_processed_request(original_text: str, intent: str, confidence: float,
+                            entity_items: tuple) -> ProcessedRequest:
+    """Build a ProcessedRequest once per signature
+    
+    Tests treat ProcessedRequest as read-only: nothing in shared.models mutates
+    it after construction, and tests must not either, since instances are shared.
+    """
+    return ProcessedRequest(
+        original_text=original_text,
+        intent=intent,
+        confidence=confidence,
+        entities=dict(entity_items)
+    )
+
+
+@lru_cache(maxsize=None)
+def _build_operation(original_text: str, intent: str, entity_items: tuple,
+                     user_id: str = USER_ID) -> GitHubOperation:
+    """Build a GitHubOperation via from_processed_request, once per signature
+    
+    Returned instances are shared between tests: copy them before mutating.
+    """
+    processed = _make_processed_request(original_text, intent, 0.95, entity_items)
+    return GitHubOperation.from_processed_request(processed, user_id)
+
+
+@pytest.fixture
+def make_processed_request():
+    """Cached ProcessedRequest factory, see _make_processed_request"""
+    return _make_processed_request
+
+
+@pytest.fixture
+def github_op():
+    """Shared GitHubOperation derived from a create_function ProcessedRequest"""
+    return _build_operation("create a function in my-repo", "create_function", _ENTITIES_CREATE)
+
+
+@pytest.fixture
+def direct_github_op():
+    """GitHubOperation built directly from keyword arguments"""
+    return GitHubOperation(
+        operation_type="create_file",
+        repository="test-repo",
+        file_path="src/main.py",
+        content="print('hello world')",
+        user_id=USER_ID
+    )
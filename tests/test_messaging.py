@@ -0,0 +1,200 @@
+"""
+Unit tests for shared.messaging: the queue envelope, batched publishing and consuming
+"""
+
+import asyncio
+
+import brotli
+import orjson
+import pytest
+from shared.messaging import (
+    MessageQueue, _COMPRESSION_THRESHOLD, _FLAG_BROTLI, _FLAG_RAW,
+    _PUBLISH_BATCH_SIZE, _PUBLISH_BATCH_WINDOW, _RETRY_DELAY_MAX
+)
+
+_SMALL_MESSAGE = {"channel_id": "C123456", "status": "processing"}
+_LARGE_MESSAGE = {"channel_id": "C123456", "details": "x" * (_COMPRESSION_THRESHOLD * 2)}
+
+
+class _StubPipeline:
+    """Records LPUSHes and hands them to the client as one batch on execute()"""
+    
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+    
+    def lpush(self, channel, message):
+        self.commands.append((channel, message))
+    
+    async def execute(self):
+        if self.client.fail_pipelines:
+            raise ConnectionError("Redis unavailable")
+        self.client.batches.append(self.commands)
+
+
+class _StubRedis:
+    """Just enough of redis.asyncio.Redis for the publisher and BLMPOP consumer
+    
+    blmpop() returns (or raises) the given results in order, then cancels the consumer.
+    """
+    
+    def __init__(self, blmpop_results=(), fail_pipelines=False):
+        self.batches = []
+        self.fail_pipelines = fail_pipelines
+        self._blmpop_results = list(blmpop_results)
+    
+    def pipeline(self, transaction=True):
+        return _StubPipeline(self)
+    
+    async def blmpop(self, *args, **kwargs):
+        if not self._blmpop_results:
+            raise asyncio.CancelledError
+        result = self._blmpop_results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    
+    async def close(self):
+        pass
+
+
+def _stub_queue(client: _StubRedis) -> MessageQueue:
+    """MessageQueue wired to a stub client instead of a Redis connection"""
+    queue = MessageQueue(redis_url="redis://localhost:6379")
+    queue.redis_client = client
+    return queue
+
+
+@pytest.fixture(scope="module")
+def message_queue():
+    """MessageQueue used only for (de)serialization; it never connects to Redis"""
+    return MessageQueue(redis_url="redis://localhost:6379")
+
+
+class TestMessageEnvelope:
+    def test_small_message_is_raw(self, message_queue):
+        """Test messages under the threshold are sent uncompressed"""
+        raw = message_queue._serialize_message(_SMALL_MESSAGE, priority=1)
+
+        assert raw[:1] == _FLAG_RAW
+        envelope = orjson.loads(raw[1:])
+        assert envelope["data"] == _SMALL_MESSAGE
+        assert envelope["priority"] == 1
+        assert MessageQueue._deserialize_message(raw) == _SMALL_MESSAGE
+
+    def test_large_message_is_brotli_compressed(self, message_queue):
+        """Test messages over the threshold are brotli-compressed"""
+        raw = message_queue._serialize_message(_LARGE_MESSAGE, priority=0)
+
+        assert raw[:1] == _FLAG_BROTLI
+        assert len(raw) < _COMPRESSION_THRESHOLD
+        assert orjson.loads(brotli.decompress(raw[1:]))["data"] == _LARGE_MESSAGE
+        assert MessageQueue._deserialize_message(raw) == _LARGE_MESSAGE
+
+    def test_legacy_unprefixed_json(self):
+        """Test envelopes written before payload flags existed still decode"""
+        raw = orjson.dumps({"data": _SMALL_MESSAGE, "priority": 0, "timestamp": 0.0})
+
+        assert MessageQueue._deserialize_message(raw) == _SMALL_MESSAGE
+
+    @pytest.mark.parametrize("raw,error", [
+        (_FLAG_BROTLI + b"not brotli", brotli.error),
+        (_FLAG_RAW + b"{not json", orjson.JSONDecodeError),
+    ])
+    def test_corrupt_payload_raises(self, raw, error):
+        """Test corrupt frames raise instead of decoding to garbage"""
+        with pytest.raises(error):
+            MessageQueue._deserialize_message(raw)
+
+
+class TestPublishNowait:
+    @pytest.mark.asyncio
+    async def test_batches_are_capped_at_batch_size(self):
+        """Test a burst is split into pipelines of at most _PUBLISH_BATCH_SIZE"""
+        client = _StubRedis()
+        queue = _stub_queue(client)
+        
+        for i in range(_PUBLISH_BATCH_SIZE + 2):
+            queue.publish_nowait("github_requests", {"i": i})
+        await queue.disconnect()
+        
+        assert [len(batch) for batch in client.batches] == [_PUBLISH_BATCH_SIZE, 2]
+        assert MessageQueue._deserialize_message(client.batches[1][1][1]) == {"i": _PUBLISH_BATCH_SIZE + 1}
+
+    @pytest.mark.asyncio
+    async def test_batch_window_closes(self):
+        """Test messages published after the batch window go in the next pipeline"""
+        client = _StubRedis()
+        queue = _stub_queue(client)
+        
+        queue.publish_nowait("github_requests", {"i": 0})
+        await asyncio.sleep(_PUBLISH_BATCH_WINDOW * 4)
+        queue.publish_nowait("github_requests", {"i": 1})
+        await queue.disconnect()
+        
+        assert [len(batch) for batch in client.batches] == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_failed_pipeline_still_marks_messages_done(self):
+        """Test a failing pipeline doesn't leave disconnect() waiting on its messages"""
+        queue = _stub_queue(_StubRedis(fail_pipelines=True))
+        
+        for i in range(3):
+            queue.publish_nowait("github_requests", {"i": i})
+        await asyncio.wait_for(queue.disconnect(), 1)
+        
+        assert queue._publish_queue.empty()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_flushes_after_publisher_died(self):
+        """Test disconnect() restarts a dead publisher to write queued messages"""
+        client = _StubRedis()
+        queue = _stub_queue(client)
+        
+        queue.publish_nowait("github_requests", {"i": 0})
+        queue._publisher_task.cancel()
+        await asyncio.sleep(0)
+        await asyncio.wait_for(queue.disconnect(), 1)
+        
+        assert [len(batch) for batch in client.batches] == [1]
+        assert queue._publisher_task is None
+
+
+class TestMultiConsumeBatches:
+    @pytest.mark.asyncio
+    async def test_yields_decoded_channel_and_skips_bad_frames(self, message_queue):
+        """Test bad frames are dropped individually and channel names decoded"""
+        good = [message_queue._serialize_message({"i": i}, 0) for i in range(2)]
+        queue = _stub_queue(_StubRedis([
+            (b"operation_updates", [good[0], _FLAG_RAW + b"{not json", good[1]]),
+            (b"operation_updates", [_FLAG_BROTLI + b"not brotli"]),
+        ]))
+        
+        batches = [batch async for batch in queue.multi_consume_batches(["operation_updates"])]
+        
+        assert batches == [("operation_updates", [{"i": 0}, {"i": 1}])]
+
+    @pytest.mark.asyncio
+    async def test_backs_off_on_redis_errors(self, message_queue, sleeps):
+        """Test Redis errors back off and the consumer resumes afterwards"""
+        queue = _stub_queue(_StubRedis([
+            ConnectionError("Redis unavailable"),
+            (b"operation_updates", [message_queue._serialize_message({"i": 0}, 0)]),
+        ]))
+        
+        batches = [batch async for batch in queue.multi_consume_batches(["operation_updates"])]
+        
+        assert batches == [("operation_updates", [{"i": 0}])]
+        assert len(sleeps) == 1
+
+
+class TestBackoff:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("retry_delay,base,next_delay", [
+        (0.1, 0.1, 0.2),
+        (_RETRY_DELAY_MAX * 2, _RETRY_DELAY_MAX, _RETRY_DELAY_MAX * 2),  # capped
+    ])
+    async def test_backoff(self, sleeps, retry_delay, base, next_delay):
+        """Test the delay doubles, is capped and gets up to 50% jitter"""
+        assert await MessageQueue._backoff(retry_delay) == next_delay
+        assert base <= sleeps[0] <= base * 1.5
@@ -1,30 +1,59 @@
 """
+PYTEST_DONT_REWRITE
 Unit tests for shared.models module
 """
 
+import string
+
 import pytest
-from datetime import datetime
+from hypothesis import given, strategies as st
 from shared.models import (
-    CommandType, SlackRequest, ProcessedRequest, Entity,
-    GitHubOperation, OperationResult, OperationStatus,
+    CommandType, SlackRequest, Entity,
+    OperationResult, OperationStatus,
     UserPreferences, SlackMessage
 )
 
+# Entity mapping shared by the tests below; ProcessedRequest never mutates it
+_ENTITIES_BASIC = {"repository": "my-repo", "language": "python"}
+
+# Slack IDs are uppercase alphanumerics; free text is kept printable. Explicit
+# alphabets also spare hypothesis from building its full unicode charmap.
+_slack_ids = st.text(alphabet=string.ascii_uppercase + string.digits, min_size=1)
+_slack_text = st.text(alphabet=string.printable)
+
+_EXPECTED_BUTTON = {
+    "type": "button",
+    "text": {"type": "plain_text", "text": "Approve"},
+    "action_id": "approve_action",
+    "value": "approve_123"
+}
+
+_EXPECTED_CODE_BLOCK = {
+    "type": "section",
+    "text": {"type": "mrkdwn", "text": "```python\ndef hello():\n    print('Hello!')\n```"}
+}
+
+
+def test_default_timestamps_use_model_clock(freeze_clock):
+    """Test that default timestamps come from the models' clock"""
+    assert SlackRequest(user_id="u", channel_id="c", command="x").timestamp == freeze_clock
+    assert OperationResult(operation_id="op", status=OperationStatus.PENDING, success=False).start_time == freeze_clock
+
 
 class TestSlackRequest:
-    def test_slack_request_creation(self):
+    @given(_slack_ids, _slack_ids, _slack_text)
+    def test_slack_request_creation(self, user_id, channel_id, command):
         """Test basic SlackRequest creation"""
         request = SlackRequest(
-            user_id="U123456",
-            channel_id="C123456",
-            command="create a python function"
+            user_id=user_id,
+            channel_id=channel_id,
+            command=command
         )
         
-        assert request.user_id == "U123456"
-        assert request.channel_id == "C123456"
-        assert request.command == "create a python function"
+        assert request.user_id == user_id
+        assert request.channel_id == channel_id
+        assert request.command == command
         assert request.command_type == CommandType.GITHUB
-        assert isinstance(request.timestamp, datetime)
 
     def test_slack_request_with_custom_type(self):
         """Test SlackRequest with custom command type"""
@@ -39,83 +68,55 @@ class TestSlackRequest:
 
 
 class TestProcessedRequest:
-    def test_processed_request_creation(self):
+    def test_processed_request_creation(self, make_processed_request):
         """Test ProcessedRequest creation and methods"""
-        entities = {"repository": "my-repo", "language": "python"}
-        request = ProcessedRequest(
-            original_text="create a function in my-repo",
-            intent="create_function",
-            confidence=0.95,
-            entities=entities
+        request = make_processed_request(
+            "create a function in my-repo",
+            "create_function",
+            0.95,
+            tuple(_ENTITIES_BASIC.items())
         )
         
         assert request.original_text == "create a function in my-repo"
         assert request.intent == "create_function"
         assert request.confidence == 0.95
-        assert request.entities == entities
-
-    def test_get_entity(self):
+        assert request.entities.model_dump(exclude_none=True) == _ENTITIES_BASIC
+        assert request.entities.repository == "my-repo"
+        assert request.entities.language == "python"
+
+    @pytest.mark.parametrize("entity_type,expected", [
+        ("repo", "test-repo"),
+        ("file", "main.py"),
+        ("nonexistent", None),
+    ])
+    def test_get_entity(self, sample_processed_request, entity_type, expected):
         """Test get_entity method"""
-        request = ProcessedRequest(
-            original_text="test",
-            intent="test",
-            confidence=0.8,
-            entities={"repo": "test-repo", "file": "main.py"}
-        )
-        
-        assert request.get_entity("repo") == "test-repo"
-        assert request.get_entity("file") == "main.py"
-        assert request.get_entity("nonexistent") is None
+        assert sample_processed_request.get_entity(entity_type) == expected
 
-    def test_has_entity(self):
+    @pytest.mark.parametrize("entity_type,expected", [
+        ("repo", True),
+        ("nonexistent", False),
+    ])
+    def test_has_entity(self, sample_processed_request, entity_type, expected):
         """Test has_entity method"""
-        request = ProcessedRequest(
-            original_text="test",
-            intent="test", 
-            confidence=0.8,
-            entities={"repo": "test-repo"}
-        )
-        
-        assert request.has_entity("repo") is True
-        assert request.has_entity("nonexistent") is False
+        assert sample_processed_request.has_entity(entity_type) is expected
 
 
 class TestGitHubOperation:
-    def test_github_operation_creation(self):
+    def test_github_operation_creation(self, direct_github_op):
         """Test GitHubOperation creation"""
-        operation = GitHubOperation(
-            operation_type="create_file",
-            repository="test-repo",
-            file_path="src/main.py",
-            content="print('hello world')",
-            user_id="U123456"
-        )
-        
-        assert operation.operation_type == "create_file"
-        assert operation.repository == "test-repo"
-        assert operation.file_path == "src/main.py"
-        assert operation.user_id == "U123456"
+        assert direct_github_op.operation_type == "create_file"
+        assert direct_github_op.repository == "test-repo"
+        assert direct_github_op.file_path == "src/main.py"
+        assert direct_github_op.user_id == "U123456"
 
-    def test_from_processed_request(self):
+    def test_from_processed_request(self, github_op):
         """Test creating GitHubOperation from ProcessedRequest"""
-        processed = ProcessedRequest(
-            original_text="create a function in my-repo",
-            intent="create_function",
-            confidence=0.95,
-            entities={
-                "repository": "my-repo",
-                "file": "utils.py",
-                "language": "python"
-            }
-        )
-        
-        operation = GitHubOperation.from_processed_request(processed, "U123456")
-        
-        assert operation.operation_type == "create_function"
-        assert operation.repository == "my-repo"
-        assert operation.file_path == "utils.py"
-        assert operation.user_id == "U123456"
-        assert operation.parameters["language"] == "python"
+        assert github_op.operation_type == "create_function"
+        assert github_op.repository == "my-repo"
+        assert github_op.file_path == "utils.py"
+        assert github_op.user_id == "U123456"
+        assert github_op.parameters["language"] == "python"
 
 
 class TestOperationResult:
@@ -130,45 +131,35 @@ class TestOperationResult:
         assert result.operation_id == "op123"
         assert result.status == OperationStatus.PENDING
         assert result.success is False
-        assert isinstance(result.start_time, datetime)
 
-    def test_mark_completed_success(self):
-        """Test marking operation as successfully completed"""
-        result = OperationResult(
-            operation_id="op123",
-            status=OperationStatus.PROCESSING,
-            success=False
-        )
-        
-        result_data = {"file_url": "https://github.com/repo/blob/main/file.py"}
-        result.mark_completed(success=True, result_data=result_data)
-        
-        assert result.success is True
-        assert result.status == OperationStatus.COMPLETED
-        assert result.result_data == result_data
-        assert result.end_time is not None
-        assert result.processing_time is not None
-
-    def test_mark_completed_failure(self):
-        """Test marking operation as failed"""
-        result = OperationResult(
-            operation_id="op123",
-            status=OperationStatus.PROCESSING,
-            success=False
-        )
-        
-        error_msg = "Repository not found"
-        result.mark_completed(success=False, error_message=error_msg)
-        
-        assert result.success is False
-        assert result.status == OperationStatus.FAILED
-        assert result.error_message == error_msg
+    @pytest.mark.parametrize("success,expected_status,completion_kwargs,attr,expected_value", [
+        (
+            True, OperationStatus.COMPLETED,
+            {"result_data": {"file_url": "https://github.com/repo/blob/main/file.py"}},
+            "result_data", {"file_url": "https://github.com/repo/blob/main/file.py"}
+        ),
+        (
+            False, OperationStatus.FAILED,
+            {"error_message": "Repository not found"},
+            "error_message", "Repository not found"
+        ),
+    ])
+    def test_mark_completed(self, processing_result, success, expected_status,
+                            completion_kwargs, attr, expected_value):
+        """Test marking operation as completed or failed"""
+        processing_result.mark_completed(success=success, **completion_kwargs)
+        
+        assert processing_result.success is success
+        assert processing_result.status == expected_status
+        assert getattr(processing_result, attr) == expected_value
+        assert processing_result.end_time is not None
+        assert processing_result.processing_time is not None
 
 
 class TestUserPreferences:
-    def test_user_preferences_creation(self):
+    def test_user_preferences_creation(self, user_preferences):
         """Test UserPreferences creation with defaults"""
-        prefs = UserPreferences(user_id="U123456")
+        prefs = user_preferences
         
         assert prefs.user_id == "U123456"
         assert prefs.preferred_language == "python"
@@ -176,16 +167,17 @@ class TestUserPreferences:
         assert prefs.auto_create_pr is True
         assert prefs.repositories == []
 
-    def test_add_repository(self):
+    @pytest.mark.parametrize("added,expected", [
+        (["my-repo"], ["my-repo"]),
+        (["my-repo", "another-repo"], ["my-repo", "another-repo"]),
+        (["my-repo", "another-repo", "my-repo"], ["my-repo", "another-repo"]),  # duplicate
+    ])
+    def test_add_repository(self, user_preferences, added, expected):
         """Test adding repository to user preferences"""
-        prefs = UserPreferences(user_id="U123456")
-        prefs.add_repository("my-repo")
-        prefs.add_repository("another-repo")
-        prefs.add_repository("my-repo")  # duplicate
+        for repo_name in added:
+            user_preferences.add_repository(repo_name)
         
-        assert len(prefs.repositories) == 2
-        assert "my-repo" in prefs.repositories
-        assert "another-repo" in prefs.repositories
+        assert user_preferences.repositories == expected
 
     def test_remove_repository(self):
         """Test removing repository from user preferences"""
@@ -203,30 +195,30 @@ class TestUserPreferences:
 
 
 class TestSlackMessage:
-    def test_slack_message_creation(self):
+    @given(_slack_ids, _slack_text)
+    def test_slack_message_creation(self, channel_id, text):
         """Test SlackMessage creation"""
         message = SlackMessage(
-            channel_id="C123456",
-            text="Hello world!"
+            channel_id=channel_id,
+            text=text
         )
         
-        assert message.channel_id == "C123456"
-        assert message.text == "Hello world!"
-        assert message.blocks is None
-        assert message.message_type == "message"
+        assert message.model_dump() == {
+            "channel_id": channel_id,
+            "text": text,
+            "blocks": None,
+            "thread_ts": None,
+            "user_id": None,
+            "message_type": "message"
+        }
 
     def test_add_code_block(self):
         """Test adding code block to message"""
         message = SlackMessage(channel_id="C123456", text="Check this code:")
         
-        code = "def hello():\n    print('Hello!')"
-        message.add_code_block(code, "python")
+        message.add_code_block("def hello():\n    print('Hello!')", "python")
         
-        assert message.blocks is not None
-        assert len(message.blocks) == 1
-        assert message.blocks[0]["type"] == "section"
-        assert "python" in message.blocks[0]["text"]["text"]
-        assert code in message.blocks[0]["text"]["text"]
+        assert message.blocks == [_EXPECTED_CODE_BLOCK]
 
     def test_add_button(self):
         """Test adding button to message"""
@@ -234,17 +226,4 @@ class TestSlackMessage:
         
         message.add_button("Approve", "approve_action", "approve_123")
         
-        assert message.blocks is not None
-        assert len(message.blocks) == 1
-        assert message.blocks[0]["type"] == "actions"
-        assert len(message.blocks[0]["elements"]) == 1
-        
-        button = message.blocks[0]["elements"][0]
-        assert button["type"] == "button"
-        assert button["text"]["text"] == "Approve"
-        assert button["action_id"] == "approve_action"
-        assert button["value"] == "approve_123"
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+        assert message.blocks == [{"type": "actions", "elements": [_EXPECTED_BUTTON]}]